@@ -4,12 +4,18 @@ Comprehensive Test Suite for QuantumCertify Application
 Tests all edge cases, error conditions, and functionality
 """
 
+import sys
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import time
 import os
 import tempfile
 import base64
+import functools
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from cryptography import x509
 from cryptography.x509.oid import NameOID, ExtendedKeyUsageOID
 from cryptography.hazmat.primitives import hashes, serialization
@@ -17,206 +23,373 @@ from cryptography.hazmat.primitives.asymmetric import rsa, ec
 import datetime
 from typing import Dict, List, Tuple
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # Optional: falls back to the stdlib json parser
+    _json_loads = json.loads
+
+# Key size for tests that only exercise the upload path; size doesn't change the code path
+_KEY_SIZE_FOR_FUNCTIONAL = 1024
+
+def _record(test_name: str):
+    """Decorate a test returning (success, details): time it, turn errors into failures and log it"""
+    def decorator(test_fn):
+        @functools.wraps(test_fn)
+        def wrapper(self, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                success, details = test_fn(self, *args, **kwargs)
+            except Exception as e:
+                success, details = False, f"Error: {str(e)}"
+            self.log_test(test_name, success, details, time.perf_counter() - start)
+            return success
+        return wrapper
+    return decorator
+
+
+class StreamingMultipartBody:
+    """multipart/form-data body whose single file part is generated on the fly.
+
+    Lets oversized-upload tests send megabytes of filler without ever holding
+    the whole payload (or a multipart copy of it) in memory.
+    """
+
+    def __init__(self, field: str, filename: str, mime_type: str, size: int,
+                 fill: bytes = b"A", chunk_size: int = 64 * 1024):
+        boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        self._head = (
+            f'--{boundary}\r\n'
+            f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            f'Content-Type: {mime_type}\r\n\r\n'
+        ).encode()
+        self._tail = f'\r\n--{boundary}--\r\n'.encode()
+        self._size = size
+        self._chunk = fill * chunk_size
+        self._chunks = self._generate()
+        self._buffer = bytearray()
+
+    def _generate(self):
+        yield self._head
+        remaining = self._size
+        while remaining > 0:
+            chunk = self._chunk if remaining >= len(self._chunk) else self._chunk[:remaining]
+            remaining -= len(chunk)
+            yield chunk
+        yield self._tail
+
+    def __len__(self):
+        return len(self._head) + self._size + len(self._tail)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        data = self.read(len(self._chunk))
+        if not data:
+            raise StopIteration
+        return data
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += next(self._chunks)
+            except StopIteration:
+                break
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
 class QuantumCertifyTester:
+    # Key generation dominates certificate creation (RSA especially), so each
+    # (key_type, key_size) key is generated once and shared by every test
+    _key_cache: Dict[Tuple[str, int], object] = {}
+    # Builders with subject/issuer/key/SAN already set; only serial and dates vary
+    _builder_cache: Dict[Tuple[str, int], x509.CertificateBuilder] = {}
+    # One finished certificate per (key_type, key_size, encoding) for tests that don't need a unique serial
+    _cert_cache: Dict[Tuple[str, int, str], bytes] = {}
+
+    # Subject/issuer and SAN are identical for every test certificate
+    _SUBJECT = x509.Name([
+        x509.NameAttribute(NameOID.COUNTRY_NAME, "US"),
+        x509.NameAttribute(NameOID.STATE_OR_PROVINCE_NAME, "Test State"),
+        x509.NameAttribute(NameOID.LOCALITY_NAME, "Test City"),
+        x509.NameAttribute(NameOID.ORGANIZATION_NAME, "Test Org"),
+        x509.NameAttribute(NameOID.COMMON_NAME, "test.example.com"),
+    ])
+    _SAN_EXT = x509.SubjectAlternativeName([
+        x509.DNSName("test.example.com"),
+    ])
+
     def __init__(self, base_url: str = "http://localhost:8000"):
         self.base_url = base_url
         self.session = requests.Session()
+        # Keep-alive pool sized for the concurrent upload workers
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.1)
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'Connection': 'keep-alive', 'Accept-Encoding': 'gzip, deflate'})
+        # (connect, read): a hung endpoint fails its test instead of stalling the suite
+        self.timeout = (5, 30)
         self.test_results = []
+        self._log_lines: List[str] = []
+        self._cert_pool: List[bytes] = []
         
-    def log_test(self, test_name: str, success: bool, details: str = ""):
-        """Log test results"""
+    def log_test(self, test_name: str, success: bool, details: str = "", duration: float = 0.0):
+        """Log test results (output is buffered until flush_log)"""
         status = "✅ PASS" if success else "❌ FAIL"
         result = f"{status} | {test_name}"
         if details:
             result += f" | {details}"
-        print(result)
+        self._log_lines.append(result)
         self.test_results.append({
             'test': test_name,
             'success': success,
-            'details': details
+            'details': details,
+            'duration': duration
         })
 
+    def flush_log(self):
+        """Write all buffered test result lines in one go"""
+        if self._log_lines:
+            sys.stdout.write("\n".join(self._log_lines) + "\n")
+            sys.stdout.flush()
+            self._log_lines.clear()
+
+    @_record("API Health Check")
     def test_api_health(self):
         """Test API health endpoint"""
-        try:
-            response = self.session.get(f"{self.base_url}/health")
-            success = response.status_code == 200
-            details = f"Status: {response.status_code}"
-            if success:
-                data = response.json()
-                details += f" | Service: {data.get('service', 'Unknown')}"
-        except Exception as e:
-            success = False
-            details = f"Error: {str(e)}"
+        response = self.session.get(f"{self.base_url}/health", timeout=self.timeout)
+        success = response.status_code == 200
+        details = f"Status: {response.status_code}"
+        if success:
+            data = _json_loads(response.content)
+            details += f" | Service: {data.get('service', 'Unknown')}"
         
-        self.log_test("API Health Check", success, details)
-        return success
+        return success, details
 
+    @_record("Dashboard Statistics")
     def test_dashboard_statistics(self):
         """Test dashboard statistics endpoint"""
-        try:
-            response = self.session.get(f"{self.base_url}/dashboard-statistics")
-            success = response.status_code == 200
-            details = f"Status: {response.status_code}"
-            if success:
-                data = response.json()
-                stats = data.get('statistics', {})
-                details += f" | Total: {stats.get('totalCertificatesAnalyzed', 0)}"
-        except Exception as e:
-            success = False
-            details = f"Error: {str(e)}"
-        
-        self.log_test("Dashboard Statistics", success, details)
-        return success
-
-    def create_test_certificate(self, key_type: str = "rsa", key_size: int = 2048) -> bytes:
-        """Create a test certificate with specified parameters"""
-        if key_type == "rsa":
-            private_key = rsa.generate_private_key(
-                public_exponent=65537,
-                key_size=key_size
+        response = self.session.get(f"{self.base_url}/dashboard-statistics", timeout=self.timeout)
+        success = response.status_code == 200
+        details = f"Status: {response.status_code}"
+        if success:
+            data = _json_loads(response.content)
+            stats = data.get('statistics', {})
+            details += f" | Total: {stats.get('totalCertificatesAnalyzed', 0)}"
+        
+        return success, details
+
+    def get_private_key(self, key_type: str = "rsa", key_size: int = 2048):
+        """Return the cached private key for the given parameters, generating it on first use"""
+        cache_key = (key_type, key_size if key_type == "rsa" else 0)
+        private_key = self._key_cache.get(cache_key)
+        if private_key is None:
+            if key_type == "rsa":
+                private_key = rsa.generate_private_key(
+                    public_exponent=65537,
+                    key_size=key_size
+                )
+            elif key_type == "ec":
+                private_key = ec.generate_private_key(ec.SECP256R1())
+            else:
+                raise ValueError(f"Unsupported key type: {key_type}")
+            private_key = self._key_cache.setdefault(cache_key, private_key)
+        return private_key
+
+    def get_cert_prototype(self, key_type: str = "rsa", key_size: int = 2048) -> x509.CertificateBuilder:
+        """Return the partially built CertificateBuilder for the given key parameters"""
+        cache_key = (key_type, key_size if key_type == "rsa" else 0)
+        builder = self._builder_cache.get(cache_key)
+        if builder is None:
+            builder = x509.CertificateBuilder().subject_name(
+                self._SUBJECT
+            ).issuer_name(
+                self._SUBJECT
+            ).public_key(
+                self.get_private_key(key_type, key_size).public_key()
+            ).add_extension(
+                self._SAN_EXT,
+                critical=False,
             )
-        elif key_type == "ec":
-            private_key = ec.generate_private_key(ec.SECP256R1())
-        else:
-            raise ValueError(f"Unsupported key type: {key_type}")
-
-        subject = issuer = x509.Name([
-            x509.NameAttribute(NameOID.COUNTRY_NAME, "US"),
-            x509.NameAttribute(NameOID.STATE_OR_PROVINCE_NAME, "Test State"),
-            x509.NameAttribute(NameOID.LOCALITY_NAME, "Test City"),
-            x509.NameAttribute(NameOID.ORGANIZATION_NAME, "Test Org"),
-            x509.NameAttribute(NameOID.COMMON_NAME, "test.example.com"),
-        ])
-
-        cert = x509.CertificateBuilder().subject_name(
-            subject
-        ).issuer_name(
-            issuer
-        ).public_key(
-            private_key.public_key()
-        ).serial_number(
+            builder = self._builder_cache.setdefault(cache_key, builder)
+        return builder
+
+    def cached_test_certificate(self, key_type: str = "rsa", key_size: int = 2048, encoding: str = "pem") -> bytes:
+        """Return one memoized certificate per key type, for tests that don't need a unique serial"""
+        cache_key = (key_type, key_size if key_type == "rsa" else 0, encoding)
+        cert_data = self._cert_cache.get(cache_key)
+        if cert_data is None:
+            cert_data = self.create_test_certificate(key_type, key_size, encoding)
+            cert_data = self._cert_cache.setdefault(cache_key, cert_data)
+        return cert_data
+
+    def create_test_certificate(self, key_type: str = "rsa", key_size: int = 2048, encoding: str = "pem") -> bytes:
+        """Create a test certificate with specified parameters (PEM, or raw DER with encoding='der')"""
+        private_key = self.get_private_key(key_type, key_size)
+
+        now = datetime.datetime.utcnow()
+        cert = self.get_cert_prototype(key_type, key_size).serial_number(
             x509.random_serial_number()
         ).not_valid_before(
-            datetime.datetime.utcnow()
+            now
         ).not_valid_after(
-            datetime.datetime.utcnow() + datetime.timedelta(days=365)
-        ).add_extension(
-            x509.SubjectAlternativeName([
-                x509.DNSName("test.example.com"),
-            ]),
-            critical=False,
+            now + datetime.timedelta(days=365)
         ).sign(private_key, hashes.SHA256())
 
+        if encoding == "der":
+            return cert.public_bytes(serialization.Encoding.DER)
         return cert.public_bytes(serialization.Encoding.PEM)
 
-    def test_certificate_upload_valid(self):
-        """Test valid certificate upload"""
+    def prepare_cert_pool(self, count: int = 8):
+        """Pre-build distinct RSA certificates before the timed tests start"""
+        # With the key cached each certificate is a single signature, cheaper inline than the
+        # fork/spawn and pickling a process pool would add (and workers would regenerate the key)
         try:
-            # Create a test RSA certificate
-            cert_data = self.create_test_certificate("rsa", 2048)
-            
-            files = {'file': ('test_cert.pem', cert_data, 'application/x-pem-file')}
-            response = self.session.post(f"{self.base_url}/upload-certificate", files=files)
-            
-            success = response.status_code == 200
-            details = f"Status: {response.status_code}"
-            
-            if success:
-                data = response.json()
-                details += f" | Quantum Safe: {data.get('is_quantum_safe', False)}"
-                details += f" | Algorithm: {data.get('signature_algorithm', 'Unknown')}"
-            
+            self._cert_pool = [self.create_test_certificate("rsa", 2048) for _ in range(count)]
         except Exception as e:
-            success = False
-            details = f"Error: {str(e)}"
+            # Tests fall back to building certificates inline
+            print(f"⚠️ Could not pre-generate certificates: {e}")
+            self._cert_pool = []
+
+    def take_certificate(self) -> bytes:
+        """Pop a pre-built distinct RSA certificate, generating one if the pool is empty"""
+        try:
+            return self._cert_pool.pop()
+        except IndexError:
+            return self.create_test_certificate("rsa", 2048)
+
+    @_record("Valid Certificate Upload (RSA)")
+    def test_certificate_upload_valid(self):
+        """Test valid certificate upload"""
+        # Create a test RSA certificate
+        cert_data = self.cached_test_certificate("rsa", _KEY_SIZE_FOR_FUNCTIONAL)
+        
+        files = {'file': ('test_cert.pem', cert_data, 'application/x-pem-file')}
+        response = self.session.post(f"{self.base_url}/upload-certificate", files=files, timeout=self.timeout)
+        
+        success = response.status_code == 200
+        details = f"Status: {response.status_code}"
+        
+        if success:
+            data = _json_loads(response.content)
+            details += f" | Quantum Safe: {data.get('is_quantum_safe', False)}"
+            details += f" | Algorithm: {data.get('signature_algorithm', 'Unknown')}"
+        
+        return success, details
+
+    @_record("Valid Certificate Upload (RSA-2048)")
+    def test_certificate_upload_rsa2048(self):
+        """Test upload of a realistic RSA-2048 certificate (nightly runs only)"""
+        cert_data = self.cached_test_certificate("rsa", 2048)
+        
+        files = {'file': ('test_cert_2048.pem', cert_data, 'application/x-pem-file')}
+        response = self.session.post(f"{self.base_url}/upload-certificate", files=files, timeout=self.timeout)
         
-        self.log_test("Valid Certificate Upload (RSA)", success, details)
-        return success
+        success = response.status_code == 200
+        details = f"Status: {response.status_code}"
+        
+        if success:
+            data = _json_loads(response.content)
+            details += f" | Algorithm: {data.get('signature_algorithm', 'Unknown')}"
+        
+        return success, details
 
+    @_record("Valid Certificate Upload (ECC)")
     def test_certificate_upload_ec(self):
         """Test ECC certificate upload"""
-        try:
-            # Create a test ECC certificate
-            cert_data = self.create_test_certificate("ec")
-            
-            files = {'file': ('test_cert_ec.pem', cert_data, 'application/x-pem-file')}
-            response = self.session.post(f"{self.base_url}/upload-certificate", files=files)
-            
-            success = response.status_code == 200
-            details = f"Status: {response.status_code}"
-            
-            if success:
-                data = response.json()
-                details += f" | Quantum Safe: {data.get('is_quantum_safe', False)}"
-                details += f" | Algorithm: {data.get('signature_algorithm', 'Unknown')}"
-            
-        except Exception as e:
-            success = False
-            details = f"Error: {str(e)}"
+        # Create a test ECC certificate
+        cert_data = self.cached_test_certificate("ec")
+        
+        files = {'file': ('test_cert_ec.pem', cert_data, 'application/x-pem-file')}
+        response = self.session.post(f"{self.base_url}/upload-certificate", files=files, timeout=self.timeout)
+        
+        success = response.status_code == 200
+        details = f"Status: {response.status_code}"
+        
+        if success:
+            data = _json_loads(response.content)
+            details += f" | Quantum Safe: {data.get('is_quantum_safe', False)}"
+            details += f" | Algorithm: {data.get('signature_algorithm', 'Unknown')}"
+        
+        return success, details
+
+    @_record("Valid Certificate Upload (DER)")
+    def test_certificate_upload_der(self):
+        """Test DER-encoded certificate upload"""
+        # DER skips the base64 armor, so the server parses raw ASN.1 directly
+        cert_data = self.cached_test_certificate("rsa", _KEY_SIZE_FOR_FUNCTIONAL, "der")
         
-        self.log_test("Valid Certificate Upload (ECC)", success, details)
-        return success
+        files = {'file': ('test_cert.der', cert_data, 'application/pkix-cert')}
+        response = self.session.post(f"{self.base_url}/upload-certificate", files=files, timeout=self.timeout)
+        
+        success = response.status_code == 200
+        details = f"Status: {response.status_code}"
+        
+        if success:
+            data = _json_loads(response.content)
+            details += f" | Algorithm: {data.get('signature_algorithm', 'Unknown')}"
+        
+        return success, details
 
+    @_record("Invalid File Upload")
     def test_certificate_upload_invalid_file(self):
         """Test invalid file upload"""
-        try:
-            # Upload a non-certificate file
-            invalid_data = b"This is not a certificate"
-            files = {'file': ('invalid.txt', invalid_data, 'text/plain')}
-            response = self.session.post(f"{self.base_url}/upload-certificate", files=files)
-            
-            success = response.status_code == 400  # Should fail with 400
-            details = f"Status: {response.status_code}"
-            
-            if response.status_code == 400:
-                data = response.json()
-                details += f" | Error: {data.get('detail', 'Unknown error')}"
-            
-        except Exception as e:
-            success = False
-            details = f"Error: {str(e)}"
+        # Upload a non-certificate file
+        invalid_data = b"This is not a certificate"
+        files = {'file': ('invalid.txt', invalid_data, 'text/plain')}
+        response = self.session.post(f"{self.base_url}/upload-certificate", files=files, timeout=self.timeout)
+        
+        success = response.status_code == 400  # Should fail with 400
+        details = f"Status: {response.status_code}"
+        
+        if response.status_code == 400:
+            data = _json_loads(response.content)
+            details += f" | Error: {data.get('detail', 'Unknown error')}"
         
-        self.log_test("Invalid File Upload", success, details)
-        return success
+        return success, details
 
+    @_record("No File Upload")
     def test_certificate_upload_no_file(self):
         """Test upload without file"""
-        try:
-            response = self.session.post(f"{self.base_url}/upload-certificate")
-            success = response.status_code == 422  # Should fail with validation error
-            details = f"Status: {response.status_code}"
-            
-        except Exception as e:
-            success = False
-            details = f"Error: {str(e)}"
+        response = self.session.post(f"{self.base_url}/upload-certificate", timeout=self.timeout)
+        success = response.status_code == 422  # Should fail with validation error
+        details = f"Status: {response.status_code}"
         
-        self.log_test("No File Upload", success, details)
-        return success
+        return success, details
 
+    @_record("Empty File Upload")
     def test_certificate_upload_empty_file(self):
         """Test upload with empty file"""
-        try:
-            files = {'file': ('empty.pem', b'', 'application/x-pem-file')}
-            response = self.session.post(f"{self.base_url}/upload-certificate", files=files)
-            
-            success = response.status_code == 400  # Should fail
-            details = f"Status: {response.status_code}"
-            
-        except Exception as e:
-            success = False
-            details = f"Error: {str(e)}"
+        files = {'file': ('empty.pem', b'', 'application/x-pem-file')}
+        response = self.session.post(f"{self.base_url}/upload-certificate", files=files, timeout=self.timeout)
+        
+        success = response.status_code == 400  # Should fail
+        details = f"Status: {response.status_code}"
         
-        self.log_test("Empty File Upload", success, details)
-        return success
+        return success, details
 
+    @_record("Large File Upload")
     def test_certificate_upload_large_file(self):
         """Test upload with oversized file"""
         try:
-            # Create a large file (simulate)
-            large_data = b"A" * (10 * 1024 * 1024)  # 10MB
-            files = {'file': ('large.pem', large_data, 'application/x-pem-file')}
-            response = self.session.post(f"{self.base_url}/upload-certificate", files=files)
+            # Stream a 10MB file instead of building it in memory
+            body = StreamingMultipartBody('file', 'large.pem', 'application/x-pem-file', 10 * 1024 * 1024)
+            response = self.session.post(
+                f"{self.base_url}/upload-certificate",
+                data=body,
+                headers={'Content-Type': body.content_type},
+                timeout=self.timeout
+            )
             
             success = response.status_code == 413 or response.status_code == 400  # Should fail
             details = f"Status: {response.status_code}"
@@ -225,137 +398,135 @@ class QuantumCertifyTester:
             success = True  # Connection errors are expected for large files
             details = f"Expected error: {str(e)}"
         
-        self.log_test("Large File Upload", success, details)
-        return success
+        return success, details
 
+    @_record("CORS Headers")
     def test_cors_headers(self):
         """Test CORS headers"""
-        try:
-            response = self.session.options(f"{self.base_url}/health")
-            success = 'Access-Control-Allow-Origin' in response.headers
-            details = f"Status: {response.status_code} | CORS: {success}"
-            
-        except Exception as e:
-            success = False
-            details = f"Error: {str(e)}"
+        # A real preflight; the response is header-only
+        response = self.session.options(
+            f"{self.base_url}/health",
+            headers={'Origin': 'http://localhost:3000', 'Access-Control-Request-Method': 'GET'},
+            timeout=self.timeout
+        )
+        success = 'Access-Control-Allow-Origin' in response.headers
+        details = f"Status: {response.status_code} | CORS: {success}"
         
-        self.log_test("CORS Headers", success, details)
-        return success
+        return success, details
 
+    @_record("Invalid Endpoint")
     def test_invalid_endpoints(self):
         """Test invalid endpoints"""
-        try:
-            response = self.session.get(f"{self.base_url}/nonexistent-endpoint")
-            success = response.status_code == 404
-            details = f"Status: {response.status_code}"
-            
-        except Exception as e:
-            success = False
-            details = f"Error: {str(e)}"
+        # HEAD is enough to see the 404 without transferring an error body
+        response = self.session.head(f"{self.base_url}/nonexistent-endpoint", allow_redirects=False, timeout=self.timeout)
+        success = response.status_code == 404
+        details = f"Status: {response.status_code}"
         
-        self.log_test("Invalid Endpoint", success, details)
-        return success
+        return success, details
 
+    @_record("Concurrent Uploads")
     def test_multiple_concurrent_uploads(self):
         """Test concurrent certificate uploads"""
-        import threading
-        import queue
+        num_uploads = 5  # 5 concurrent uploads
         
-        results = queue.Queue()
+        # Build the certificates up front so the test measures the server, not keygen
+        cert_bodies = [self.take_certificate() for _ in range(num_uploads)]
         
         def upload_cert(cert_id):
             try:
-                cert_data = self.create_test_certificate("rsa", 2048)
-                files = {'file': (f'test_cert_{cert_id}.pem', cert_data, 'application/x-pem-file')}
-                response = requests.post(f"{self.base_url}/upload-certificate", files=files)
-                results.put((cert_id, response.status_code == 200))
-            except Exception as e:
-                results.put((cert_id, False))
+                files = {'file': (f'test_cert_{cert_id}.pem', cert_bodies[cert_id], 'application/x-pem-file')}
+                response = self.session.post(f"{self.base_url}/upload-certificate", files=files, timeout=self.timeout)
+                return int(response.status_code == 200)
+            except Exception:
+                return 0
         
-        threads = []
-        for i in range(5):  # 5 concurrent uploads
-            thread = threading.Thread(target=upload_cert, args=(i,))
-            threads.append(thread)
-            thread.start()
+        with ThreadPoolExecutor(max_workers=num_uploads) as executor:
+            futures = [executor.submit(upload_cert, i) for i in range(num_uploads)]
+            statuses = [future.result() for future in as_completed(futures)]
         
-        for thread in threads:
-            thread.join()
-        
-        successful = 0
-        total = 0
-        while not results.empty():
-            cert_id, success = results.get()
-            total += 1
-            if success:
-                successful += 1
+        successful = sum(statuses)
+        total = len(statuses)
         
         overall_success = successful >= 3  # At least 3 out of 5 should succeed
         details = f"Successful: {successful}/{total}"
         
-        self.log_test("Concurrent Uploads", overall_success, details)
-        return overall_success
+        return overall_success, details
 
+    @_record("Statistics Update")
     def test_statistics_update(self):
         """Test if statistics update after certificate upload"""
-        try:
-            # Get initial stats
-            response1 = self.session.get(f"{self.base_url}/dashboard-statistics")
-            if response1.status_code != 200:
-                raise Exception("Failed to get initial stats")
-            
-            initial_stats = response1.json()['statistics']
-            initial_total = initial_stats.get('totalCertificatesAnalyzed', 0)
-            
-            # Upload a certificate
-            cert_data = self.create_test_certificate("rsa", 2048)
-            files = {'file': ('stats_test.pem', cert_data, 'application/x-pem-file')}
-            upload_response = self.session.post(f"{self.base_url}/upload-certificate", files=files)
-            
-            if upload_response.status_code != 200:
-                raise Exception("Certificate upload failed")
-            
-            # Wait a moment and get updated stats
-            time.sleep(1)
-            response2 = self.session.get(f"{self.base_url}/dashboard-statistics")
+        # Get initial stats
+        response1 = self.session.get(f"{self.base_url}/dashboard-statistics", timeout=self.timeout)
+        if response1.status_code != 200:
+            raise Exception("Failed to get initial stats")
+        
+        initial_stats = _json_loads(response1.content)['statistics']
+        initial_total = initial_stats.get('totalCertificatesAnalyzed', 0)
+        
+        # Upload a certificate
+        cert_data = self.take_certificate()
+        files = {'file': ('stats_test.pem', cert_data, 'application/x-pem-file')}
+        upload_response = self.session.post(f"{self.base_url}/upload-certificate", files=files, timeout=self.timeout)
+        
+        if upload_response.status_code != 200:
+            raise Exception("Certificate upload failed")
+        
+        # Poll until the counter moves instead of sleeping a fixed second
+        deadline = time.monotonic() + 1.0
+        while True:
+            response2 = self.session.get(f"{self.base_url}/dashboard-statistics", timeout=self.timeout)
             if response2.status_code != 200:
                 raise Exception("Failed to get updated stats")
             
-            updated_stats = response2.json()['statistics']
+            updated_stats = _json_loads(response2.content)['statistics']
             updated_total = updated_stats.get('totalCertificatesAnalyzed', 0)
-            
-            success = updated_total > initial_total
-            details = f"Initial: {initial_total} | Updated: {updated_total}"
-            
-        except Exception as e:
-            success = False
-            details = f"Error: {str(e)}"
+            if updated_total > initial_total or time.monotonic() >= deadline:
+                break
+            time.sleep(0.02)
+        
+        success = updated_total > initial_total
+        details = f"Initial: {initial_total} | Updated: {updated_total}"
         
-        self.log_test("Statistics Update", success, details)
-        return success
+        return success, details
 
     def run_all_tests(self):
         """Run all tests"""
         print("🧪 Starting Comprehensive QuantumCertify Test Suite")
         print("=" * 60)
         
-        # Basic API tests
-        self.test_api_health()
-        self.test_dashboard_statistics()
-        self.test_cors_headers()
-        self.test_invalid_endpoints()
-        
-        # Certificate upload tests
-        self.test_certificate_upload_valid()
-        self.test_certificate_upload_ec()
-        self.test_certificate_upload_invalid_file()
-        self.test_certificate_upload_no_file()
-        self.test_certificate_upload_empty_file()
-        self.test_certificate_upload_large_file()
-        
-        # Advanced tests
-        self.test_multiple_concurrent_uploads()
+        # Distinct certificates for the concurrent upload and statistics tests
+        self.prepare_cert_pool()
+        
+        # Independent tests share no state, so they run concurrently
+        independent_tests = [
+            # Basic API tests
+            self.test_api_health,
+            self.test_dashboard_statistics,
+            self.test_cors_headers,
+            self.test_invalid_endpoints,
+            # Certificate upload tests
+            self.test_certificate_upload_valid,
+            self.test_certificate_upload_ec,
+            self.test_certificate_upload_der,
+            self.test_certificate_upload_invalid_file,
+            self.test_certificate_upload_no_file,
+            self.test_certificate_upload_empty_file,
+            self.test_certificate_upload_large_file,
+            # Advanced tests
+            self.test_multiple_concurrent_uploads,
+        ]
+        if os.getenv("NIGHTLY_TESTS"):
+            independent_tests.append(self.test_certificate_upload_rsa2048)
+        
+        with ThreadPoolExecutor(max_workers=len(independent_tests)) as executor:
+            for future in [executor.submit(test) for test in independent_tests]:
+                future.result()
+        
+        # Compares counters before and after an upload, so it must not race other uploads
         self.test_statistics_update()
         
+        self.flush_log()
+        
         # Summary
         print("\n" + "=" * 60)
         print("📊 Test Summary")
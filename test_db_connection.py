@@ -1,5 +1,6 @@
 import pyodbc
 import os
+import functools
 
 # Railway environment variables
 DB_SERVER = os.getenv("DB_SERVER", "quantumcertify-sqlsrv.database.windows.net")
@@ -17,9 +18,26 @@ connection_string = f"""Driver={{ODBC Driver 18 for SQL Server}};
                         TrustServerCertificate=no;
                         Connection Timeout=30;"""
 
-try:
-    conn = pyodbc.connect(connection_string)
-    print("? Database connection successful!")
-    conn.close()
-except Exception as e:
-    print(f"? Database connection failed: {e}")
+@functools.lru_cache(maxsize=1)
+def get_conn():
+    """Open the Azure SQL connection once and reuse it for later callers"""
+    conn = pyodbc.connect(connection_string, autocommit=False)
+    conn.setencoding(encoding='utf-8')
+    return conn
+
+def get_cursor():
+    """Cursor on the shared connection with batched parameter binding enabled"""
+    cursor = get_conn().cursor()
+    cursor.fast_executemany = True
+    return cursor
+
+def main():
+    try:
+        get_conn()
+        print("? Database connection successful!")
+    except Exception as e:
+        print(f"? Database connection failed: {e}")
+
+if __name__ == "__main__":
+    main()
+
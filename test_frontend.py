@@ -4,7 +4,6 @@ Frontend Integration Test Suite for QuantumCertify
 Tests the React frontend integration and functionality
 """
 
-import time
 import json
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -14,11 +13,15 @@ from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import requests
 
+# WebDriverWait polls every 500ms by default; a tighter interval returns as soon as the DOM is ready
+POLL_INTERVAL = 0.05
+
 class FrontendTester:
     def __init__(self, frontend_url: str = "http://localhost:3000", backend_url: str = "http://localhost:8000"):
         self.frontend_url = frontend_url
         self.backend_url = backend_url
         self.driver = None
+        self._loaded = False
         self.test_results = []
         
     def setup_driver(self):
@@ -37,6 +40,12 @@ class FrontendTester:
             print("Note: Chrome WebDriver is required for frontend testing")
             return False
     
+    def _ensure_loaded(self):
+        """Navigate to the frontend once; later tests re-query the already rendered DOM"""
+        if not self._loaded:
+            self.driver.get(self.frontend_url)
+            self._loaded = True
+    
     def log_test(self, test_name: str, success: bool, details: str = ""):
         """Log test results"""
         status = "✅ PASS" if success else "❌ FAIL"
@@ -70,10 +79,10 @@ class FrontendTester:
             return False
             
         try:
-            self.driver.get(self.frontend_url)
+            self._ensure_loaded()
             
             # Wait for the page title to load
-            WebDriverWait(self.driver, 10).until(
+            WebDriverWait(self.driver, 10, poll_frequency=POLL_INTERVAL).until(
                 lambda driver: "QuantumCertify" in driver.title or len(driver.title) > 0
             )
             
@@ -97,27 +106,30 @@ class FrontendTester:
             return False
             
         try:
-            self.driver.get(self.frontend_url)
+            self._ensure_loaded()
             
             # Wait for dashboard to load
-            WebDriverWait(self.driver, 10).until(
+            WebDriverWait(self.driver, 10, poll_frequency=POLL_INTERVAL).until(
                 EC.presence_of_element_located((By.CLASS_NAME, "dashboard"))
             )
             
-            elements_found = []
-            
-            # Check for key elements
-            if self.driver.find_elements(By.TAG_NAME, "h1"):
-                elements_found.append("Title")
-            
-            if self.driver.find_elements(By.CLASS_NAME, "api-status"):
-                elements_found.append("API Status")
-            
-            if self.driver.find_elements(By.CLASS_NAME, "stats-section"):
-                elements_found.append("Statistics")
+            # Count all key elements in one WebDriver round-trip
+            counts = self.driver.execute_script(
+                "return {"
+                "title: document.getElementsByTagName('h1').length,"
+                "api: document.getElementsByClassName('api-status').length,"
+                "stats: document.getElementsByClassName('stats-section').length,"
+                "upload: document.getElementsByClassName('upload-section').length"
+                "};"
+            )
             
-            if self.driver.find_elements(By.CLASS_NAME, "upload-section"):
-                elements_found.append("Upload Section")
+            labels = [
+                ('title', "Title"),
+                ('api', "API Status"),
+                ('stats', "Statistics"),
+                ('upload', "Upload Section")
+            ]
+            elements_found = [label for key, label in labels if counts.get(key)]
             
             success = len(elements_found) >= 3  # At least 3 key elements
             details = f"Found: {', '.join(elements_found)}"
@@ -136,10 +148,10 @@ class FrontendTester:
             return False
             
         try:
-            self.driver.get(self.frontend_url)
+            self._ensure_loaded()
             
             # Wait for API status element
-            api_status_element = WebDriverWait(self.driver, 15).until(
+            api_status_element = WebDriverWait(self.driver, 15, poll_frequency=POLL_INTERVAL).until(
                 EC.presence_of_element_located((By.CLASS_NAME, "api-status"))
             )
             
@@ -165,24 +177,26 @@ class FrontendTester:
             return False
             
         try:
-            self.driver.get(self.frontend_url)
+            self._ensure_loaded()
             
             # Wait for statistics section
-            WebDriverWait(self.driver, 15).until(
+            WebDriverWait(self.driver, 15, poll_frequency=POLL_INTERVAL).until(
                 EC.presence_of_element_located((By.CLASS_NAME, "stats-section"))
             )
             
-            # Look for stat cards
-            stat_cards = self.driver.find_elements(By.CLASS_NAME, "stat-card")
+            # Count stat cards and check for numbers in one WebDriver round-trip
+            card_info = self.driver.execute_script(
+                "const cards = Array.from(document.getElementsByClassName('stat-card'));"
+                "return {count: cards.length, numbers: cards.some(c => /\\d/.test(c.innerText || ''))};"
+            )
+            card_count = card_info.get('count', 0)
             
-            success = len(stat_cards) >= 3  # Should have at least 3 stat cards
-            details = f"Found {len(stat_cards)} stat cards"
+            success = card_count >= 3  # Should have at least 3 stat cards
+            details = f"Found {card_count} stat cards"
             
             # Check if numbers are displayed
-            for card in stat_cards:
-                if card.text and any(char.isdigit() for char in card.text):
-                    details += " | Numbers displayed"
-                    break
+            if card_info.get('numbers'):
+                details += " | Numbers displayed"
             
         except Exception as e:
             success = False
@@ -198,10 +212,10 @@ class FrontendTester:
             return False
             
         try:
-            self.driver.get(self.frontend_url)
+            self._ensure_loaded()
             
             # Wait for page to load
-            WebDriverWait(self.driver, 15).until(
+            WebDriverWait(self.driver, 15, poll_frequency=POLL_INTERVAL).until(
                 EC.presence_of_element_located((By.CLASS_NAME, "dashboard"))
             )
             
@@ -209,12 +223,22 @@ class FrontendTester:
             refresh_buttons = self.driver.find_elements(By.CLASS_NAME, "refresh-btn")
             
             if refresh_buttons:
-                # Click the first refresh button
+                # Click the first refresh button and wait for the refetch to land
+                requests_before = self.driver.execute_script(
+                    "return performance.getEntriesByType('resource').length"
+                )
                 refresh_buttons[0].click()
-                time.sleep(2)  # Wait for refresh to complete
                 
                 success = True
-                details = "Refresh button clicked successfully"
+                try:
+                    WebDriverWait(self.driver, 3, poll_frequency=POLL_INTERVAL).until(
+                        lambda d: d.execute_script(
+                            "return performance.getEntriesByType('resource').length"
+                        ) > requests_before
+                    )
+                    details = "Refresh button clicked successfully"
+                except TimeoutException:
+                    details = "Refresh button clicked (no new request observed)"
             else:
                 success = False
                 details = "No refresh button found"
@@ -233,7 +257,9 @@ class FrontendTester:
             return False
             
         try:
-            self.driver.get(self.frontend_url)
+            self._ensure_loaded()
+            
+            original_size = self.driver.get_window_size()
             
             # Test different screen sizes
             screen_sizes = [
@@ -244,16 +270,27 @@ class FrontendTester:
             
             responsive_success = True
             
-            for width, height in screen_sizes:
-                self.driver.set_window_size(width, height)
-                time.sleep(1)
-                
-                # Check if page is still functional
-                try:
-                    self.driver.find_element(By.CLASS_NAME, "dashboard")
-                except NoSuchElementException:
-                    responsive_success = False
-                    break
+            try:
+                for width, height in screen_sizes:
+                    self.driver.set_window_size(width, height)
+                    
+                    # Wait for the browser to report the new width rather than sleeping
+                    try:
+                        WebDriverWait(self.driver, 2, poll_frequency=POLL_INTERVAL).until(
+                            lambda d: d.execute_script("return window.outerWidth") == width
+                        )
+                    except TimeoutException:
+                        pass  # Some window managers clamp sizes; still check the layout
+                    
+                    # Check if page is still functional
+                    try:
+                        self.driver.find_element(By.CLASS_NAME, "dashboard")
+                    except NoSuchElementException:
+                        responsive_success = False
+                        break
+            finally:
+                # Restore the viewport so later tests see a stable layout
+                self.driver.set_window_size(original_size['width'], original_size['height'])
             
             success = responsive_success
             details = f"Tested {len(screen_sizes)} screen sizes"
@@ -272,10 +309,10 @@ class FrontendTester:
             return False
             
         try:
-            self.driver.get(self.frontend_url)
+            self._ensure_loaded()
             
             # Wait for page to load
-            WebDriverWait(self.driver, 15).until(
+            WebDriverWait(self.driver, 15, poll_frequency=POLL_INTERVAL).until(
                 EC.presence_of_element_located((By.CLASS_NAME, "dashboard"))
             )
             
@@ -4,24 +4,117 @@ Performance Test Suite for QuantumCertify Application
 Tests load, stress, and performance characteristics
 """
 
+import sys
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import threading
-import statistics
+import math
 import psutil
 import json
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Tuple
+import gc
+import os
+import socket
+from urllib3 import encode_multipart_formdata
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import urlsplit
 from cryptography import x509
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.asymmetric import rsa, ed25519
 import datetime
 
+def build_test_certificate(key_size: int = 2048, algorithm: str = "rsa", encoding: str = "pem") -> bytes:
+    """Create a self-signed test certificate (module level so worker processes can pickle it)"""
+    if algorithm == "ed25519":
+        # Orders of magnitude cheaper than RSA keygen; key_size is ignored
+        private_key = ed25519.Ed25519PrivateKey.generate()
+        signature_hash = None  # Ed25519 signs without a separate digest
+    else:
+        private_key = rsa.generate_private_key(
+            public_exponent=65537,
+            key_size=key_size
+        )
+        signature_hash = hashes.SHA256()
+
+    subject = issuer = x509.Name([
+        x509.NameAttribute(x509.NameOID.COUNTRY_NAME, "US"),
+        x509.NameAttribute(x509.NameOID.ORGANIZATION_NAME, "Test Org"),
+        x509.NameAttribute(x509.NameOID.COMMON_NAME, "test.example.com"),
+    ])
+
+    cert = x509.CertificateBuilder().subject_name(
+        subject
+    ).issuer_name(
+        issuer
+    ).public_key(
+        private_key.public_key()
+    ).serial_number(
+        x509.random_serial_number()
+    ).not_valid_before(
+        datetime.datetime.utcnow()
+    ).not_valid_after(
+        datetime.datetime.utcnow() + datetime.timedelta(days=365)
+    ).sign(private_key, signature_hash)
+
+    if encoding == "der":
+        return cert.public_bytes(serialization.Encoding.DER)
+    return cert.public_bytes(serialization.Encoding.PEM)
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Mean/min/max/p95 from one sort (float math instead of statistics.mean's exact fractions)"""
+    ordered = sorted(samples)
+    count = len(ordered)
+    return {
+        'avg': math.fsum(ordered) / count,
+        'min': ordered[0],
+        'max': ordered[-1],
+        'p95': ordered[max(math.ceil(0.95 * count) - 1, 0)],  # nearest-rank percentile
+    }
+
+# Opt back into the old client-side throttling if the local server can't take full load
+SLOW_STRESS = bool(os.environ.get("SLOW_STRESS"))
+
+# Concurrent requests in test_api_response_time; that many connections are warmed first
+API_TIMING_WORKERS = 4
+
+# Shortest CPU sampling window; cpu_percent over a few ms only reports clock-tick steps
+CPU_SAMPLE_WINDOW = 0.1
+
 class PerformanceTester:
     def __init__(self, base_url: str = "http://localhost:8000"):
         self.base_url = base_url
         self.test_results = []
         
+        # Build endpoint URLs once instead of per request
+        self.url_health = f"{base_url}/health"
+        self.url_stats = f"{base_url}/dashboard-statistics"
+        self.url_upload = f"{base_url}/upload-certificate"
+        
+        parts = urlsplit(base_url)
+        self._host = parts.hostname
+        self._port = parts.port or (443 if parts.scheme == "https" else 80)
+        try:
+            # Resolve once up front so a cold resolver cache isn't paid inside a timed request
+            socket.getaddrinfo(self._host, self._port, type=socket.SOCK_STREAM)
+        except OSError:
+            pass
+        self._append_result = self.test_results.append
+        self._metric_lines: List[str] = []
+        self._cert_cache: Dict[Tuple[str, int, str], bytes] = {}
+        
+        # Shared keep-alive pool so timings don't include a TCP connect per request
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=64, pool_maxsize=128, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Connection": "keep-alive"})
+        
+        # Per-thread sessions for the concurrency/stress workers
+        self._tls = threading.local()
+        self._thread_sessions: List[requests.Session] = []
+        self._thread_sessions_lock = threading.Lock()
+        
     def log_test(self, test_name: str, success: bool, details: str = "", metrics: Dict = None):
         """Log test results"""
         status = "✅ PASS" if success else "❌ FAIL"
@@ -29,59 +122,123 @@ class PerformanceTester:
         if details:
             result += f" | {details}"
         if metrics:
-            result += f" | Metrics: {metrics}"
+            # Serialized once: reused verbatim by the summary and parseable by aggregators
+            metrics_json = json.dumps(metrics, separators=(',', ':'))
+            result += " | " + metrics_json
+            self._metric_lines.append(f"  {test_name}: {metrics_json}")
         print(result)
-        self.test_results.append({
+        self._append_result({
             'test': test_name,
             'success': success,
             'details': details,
             'metrics': metrics or {}
         })
 
-    def create_test_certificate(self, key_size: int = 2048) -> bytes:
-        """Create a test certificate"""
-        private_key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=key_size
-        )
+    def _session(self) -> requests.Session:
+        """Return this thread's own keep-alive session, avoiding contention on the shared pool"""
+        session = getattr(self._tls, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+            session.headers.update({"Connection": "keep-alive"})
+            self._tls.session = session
+            with self._thread_sessions_lock:
+                self._thread_sessions.append(session)
+        return session
+
+    def _close_thread_sessions(self):
+        """Close the per-thread sessions created by worker threads"""
+        with self._thread_sessions_lock:
+            sessions, self._thread_sessions = self._thread_sessions, []
+        for session in sessions:
+            session.close()
+
+    def create_test_certificate(self, key_size: int = 2048, algorithm: str = "rsa", encoding: str = "pem") -> bytes:
+        """Create a test certificate (cached per algorithm, key size and encoding so keygen isn't timed)"""
+        size = key_size if algorithm == "rsa" else 0
+        cache_key = (algorithm, size, encoding)
+        if cache_key not in self._cert_cache:
+            pem = self._cert_cache.get((algorithm, size, "pem"))
+            if encoding == "der" and pem is not None:
+                # Re-encode the existing certificate rather than generating another key
+                self._cert_cache[cache_key] = x509.load_pem_x509_certificate(pem).public_bytes(serialization.Encoding.DER)
+            else:
+                self._cert_cache[cache_key] = build_test_certificate(key_size, algorithm, encoding)
+        return self._cert_cache[cache_key]
 
-        subject = issuer = x509.Name([
-            x509.NameAttribute(x509.NameOID.COUNTRY_NAME, "US"),
-            x509.NameAttribute(x509.NameOID.ORGANIZATION_NAME, "Test Org"),
-            x509.NameAttribute(x509.NameOID.COMMON_NAME, "test.example.com"),
-        ])
+    def prepare_certificates(self, key_sizes: List[int]):
+        """Generate missing RSA certificates in parallel processes so keygen escapes the GIL"""
+        missing = [size for size in key_sizes if ("rsa", size, "pem") not in self._cert_cache]
+        if not missing:
+            return
+        try:
+            with ProcessPoolExecutor(max_workers=len(missing)) as executor:
+                certs = executor.map(build_test_certificate, missing)
+                self._cert_cache.update((("rsa", size, "pem"), cert) for size, cert in zip(missing, certs))
+        except Exception as e:
+            # create_test_certificate falls back to generating inline
+            print(f"⚠️ Could not pre-generate certificates: {e}")
 
-        cert = x509.CertificateBuilder().subject_name(
-            subject
-        ).issuer_name(
-            issuer
-        ).public_key(
-            private_key.public_key()
-        ).serial_number(
-            x509.random_serial_number()
-        ).not_valid_before(
-            datetime.datetime.utcnow()
-        ).not_valid_after(
-            datetime.datetime.utcnow() + datetime.timedelta(days=365)
-        ).sign(private_key, hashes.SHA256())
+    @staticmethod
+    def encode_upload(filename: str, data: bytes, mime_type: str = 'application/x-pem-file') -> Tuple[bytes, Dict[str, str]]:
+        """Encode a single-file multipart body once, without requests' intermediate file buffers"""
+        body, content_type = encode_multipart_formdata({'file': (filename, data, mime_type)})
+        return body, {'Content-Type': content_type}
 
-        return cert.public_bytes(serialization.Encoding.PEM)
+    def _warmup(self, endpoint: str = "/health", n: int = 10, workers: int = 1):
+        """Send discarded requests so timings exclude cold connections and server first-request setup"""
+        url = f"{self.base_url}{endpoint}"
+        
+        def ping(_):
+            try:
+                self.session.get(url, timeout=5)
+            except Exception:
+                pass
+        
+        if workers <= 1:
+            for i in range(n):
+                ping(i)
+            return
+        # Overlapping requests each check out their own connection, leaving `workers` warm in the pool
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(ping, range(max(n, workers))))
+
+    def _rss_mb(self) -> float:
+        """Current RSS of this process in MB, read from /proc/self/statm on Linux, else via psutil"""
+        # Not ru_maxrss: that is the process-lifetime peak, so earlier tests would mask any growth
+        try:
+            with open("/proc/self/statm", "rb") as f:
+                resident_pages = int(f.read().split()[1])
+            return resident_pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+        except (OSError, ValueError, IndexError, AttributeError):
+            return psutil.Process().memory_info().rss / 1024 / 1024
+
+    def _server_process(self) -> Optional[psutil.Process]:
+        """Find the local process listening on the base URL's port, if visible to us"""
+        port = self._port
+        try:
+            for conn in psutil.net_connections(kind="tcp"):
+                if conn.status == psutil.CONN_LISTEN and conn.laddr and conn.laddr.port == port and conn.pid:
+                    return psutil.Process(conn.pid)
+        except (psutil.AccessDenied, psutil.NoSuchProcess):
+            pass
+        return None
 
     def measure_response_time(self, url: str, method: str = "GET", **kwargs) -> Tuple[float, int, bool]:
         """Measure response time for a request"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             if method == "GET":
-                response = requests.get(url, **kwargs)
+                response = self.session.get(url, **kwargs)
             elif method == "POST":
-                response = requests.post(url, **kwargs)
+                response = self.session.post(url, **kwargs)
             else:
                 raise ValueError(f"Unsupported method: {method}")
             
-            end_time = time.time()
+            end_time = time.perf_counter()
             return end_time - start_time, response.status_code, True
         except Exception:
-            end_time = time.time()
+            end_time = time.perf_counter()
             return end_time - start_time, 0, False
 
     def test_api_response_time(self):
@@ -91,26 +248,28 @@ class PerformanceTester:
             ("/dashboard-statistics", "GET"),
         ]
         
+        # Timed fan-out is capped at the number of pooled connections warmed up front
+        workers = API_TIMING_WORKERS
+        for endpoint, _ in endpoints:
+            self._warmup(endpoint, n=2 * workers, workers=workers)
+        
         all_times = []
         failed_requests = 0
         
-        for endpoint, method in endpoints:
-            times = []
-            for _ in range(10):  # 10 requests per endpoint
-                response_time, status_code, success = self.measure_response_time(
-                    f"{self.base_url}{endpoint}", method
-                )
-                
+        # 10 requests per endpoint, spread over the warm keep-alive connections
+        calls = [(f"{self.base_url}{endpoint}", method) for endpoint, method in endpoints for _ in range(10)]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            measurements = executor.map(lambda call: self.measure_response_time(*call), calls)
+            
+            for response_time, status_code, success in measurements:
                 if success and 200 <= status_code < 300:
-                    times.append(response_time)
                     all_times.append(response_time)
                 else:
                     failed_requests += 1
         
         if all_times:
-            avg_time = statistics.mean(all_times)
-            max_time = max(all_times)
-            min_time = min(all_times)
+            summary = summarize(all_times)
+            avg_time, max_time, min_time = summary['avg'], summary['max'], summary['min']
             
             # Good performance: avg < 200ms, max < 1s
             success = avg_time < 0.2 and max_time < 1.0
@@ -119,6 +278,7 @@ class PerformanceTester:
                 'avg_response_time': round(avg_time * 1000, 2),  # ms
                 'max_response_time': round(max_time * 1000, 2),  # ms
                 'min_response_time': round(min_time * 1000, 2),  # ms
+                'p95_response_time': round(summary['p95'] * 1000, 2),  # ms
                 'failed_requests': failed_requests
             }
             
@@ -131,78 +291,88 @@ class PerformanceTester:
         self.log_test("API Response Time", success, details, metrics)
         return success
 
-    def test_concurrent_requests(self, num_threads: int = 10, requests_per_thread: int = 5):
-        """Test concurrent request handling"""
-        def make_request():
-            try:
-                response = requests.get(f"{self.base_url}/health", timeout=10)
-                return response.status_code == 200, time.time()
-            except Exception:
-                return False, time.time()
-        
-        start_time = time.time()
-        results = []
-        
-        with ThreadPoolExecutor(max_workers=num_threads) as executor:
-            # Submit all requests
-            futures = []
-            for _ in range(num_threads * requests_per_thread):
-                future = executor.submit(make_request)
-                futures.append(future)
-            
-            # Collect results
-            for future in as_completed(futures):
-                success, timestamp = future.result()
-                results.append((success, timestamp))
-        
-        end_time = time.time()
-        total_time = end_time - start_time
-        successful_requests = sum(1 for success, _ in results if success)
-        total_requests = len(results)
-        
-        success_rate = successful_requests / total_requests if total_requests > 0 else 0
-        requests_per_second = total_requests / total_time if total_time > 0 else 0
-        
-        # Good performance: >90% success rate, >50 RPS
-        success = success_rate >= 0.9 and requests_per_second >= 50
-        
-        metrics = {
-            'total_requests': total_requests,
-            'successful_requests': successful_requests,
-            'success_rate': round(success_rate * 100, 2),
-            'requests_per_second': round(requests_per_second, 2),
-            'total_time': round(total_time, 2)
-        }
-        
-        details = f"Success: {metrics['success_rate']}%, RPS: {metrics['requests_per_second']}"
+    def test_concurrent_requests(self, configs: Tuple[Tuple[int, int], ...] = ((10, 5), (20, 10))):
+        """Test concurrent request handling for each (threads, requests per thread) config"""
+        def make_request(limit: threading.BoundedSemaphore):
+            with limit:
+                try:
+                    response = self._session().get(self.url_health, timeout=10)
+                    return response.status_code == 200, time.perf_counter()
+                except Exception:
+                    return False, time.perf_counter()
+        
+        all_passed = True
+        
+        # One pool (and its warmed per-thread sessions) serves every config
+        with ThreadPoolExecutor(max_workers=max(threads for threads, _ in configs)) as executor:
+            for num_threads, requests_per_thread in configs:
+                # Caps in-flight requests at this config's thread count on the shared pool
+                limit = threading.BoundedSemaphore(num_threads)
+                start_time = time.perf_counter()
+                successful_requests = 0
+                total_requests = 0
+                
+                # Tally as map yields; it drops each Future once its result is consumed
+                for success, _ in executor.map(lambda _: make_request(limit), range(num_threads * requests_per_thread)):
+                    successful_requests += success
+                    total_requests += 1
+                
+                end_time = time.perf_counter()
+                total_time = end_time - start_time
+                
+                success_rate = successful_requests / total_requests if total_requests > 0 else 0
+                requests_per_second = total_requests / total_time if total_time > 0 else 0
+                
+                # Good performance: >90% success rate, >50 RPS
+                success = success_rate >= 0.9 and requests_per_second >= 50
+                all_passed = all_passed and success
+                
+                metrics = {
+                    'total_requests': total_requests,
+                    'successful_requests': successful_requests,
+                    'success_rate': round(success_rate * 100, 2),
+                    'requests_per_second': round(requests_per_second, 2),
+                    'total_time': round(total_time, 2)
+                }
+                
+                details = f"Success: {metrics['success_rate']}%, RPS: {metrics['requests_per_second']}"
+                
+                self.log_test(f"Concurrent Requests ({num_threads} threads)", success, details, metrics)
         
-        self.log_test(f"Concurrent Requests ({num_threads} threads)", success, details, metrics)
-        return success
+        self._close_thread_sessions()
+        return all_passed
 
     def test_file_upload_performance(self):
         """Test file upload performance"""
         cert_sizes = [1024, 2048, 4096]  # Different key sizes
+        encodings = [("pem", "application/x-pem-file"), ("der", "application/pkix-cert")]
         upload_times = []
+        times_by_encoding: Dict[str, List[float]] = {encoding: [] for encoding, _ in encodings}
+        
+        # Generate all key sizes up front so only the upload POST is timed
+        self.prepare_certificates(cert_sizes)
         
         for key_size in cert_sizes:
-            cert_data = self.create_test_certificate(key_size)
-            
-            # Measure upload time
-            start_time = time.time()
-            try:
-                files = {'file': (f'perf_test_{key_size}.pem', cert_data, 'application/x-pem-file')}
-                response = requests.post(f"{self.base_url}/upload-certificate", files=files, timeout=30)
-                end_time = time.time()
+            for encoding, mime_type in encodings:
+                cert_data = self.create_test_certificate(key_size, encoding=encoding)
+                body, headers = self.encode_upload(f'perf_test_{key_size}.{encoding}', cert_data, mime_type)
                 
-                if response.status_code == 200:
-                    upload_times.append(end_time - start_time)
-                
-            except Exception:
-                pass
+                # Measure upload time
+                start_time = time.perf_counter()
+                try:
+                    response = self.session.post(self.url_upload, data=body, headers=headers, timeout=30)
+                    end_time = time.perf_counter()
+                    
+                    if response.status_code == 200:
+                        upload_times.append(end_time - start_time)
+                        times_by_encoding[encoding].append(end_time - start_time)
+                    
+                except Exception:
+                    pass
         
         if upload_times:
-            avg_upload_time = statistics.mean(upload_times)
-            max_upload_time = max(upload_times)
+            summary = summarize(upload_times)
+            avg_upload_time, max_upload_time = summary['avg'], summary['max']
             
             # Good performance: avg < 2s, max < 5s
             success = avg_upload_time < 2.0 and max_upload_time < 5.0
@@ -212,6 +382,9 @@ class PerformanceTester:
                 'max_upload_time': round(max_upload_time, 2),
                 'certificates_tested': len(upload_times)
             }
+            for encoding, times in times_by_encoding.items():
+                if times:
+                    metrics[f'avg_{encoding}_upload_ms'] = round(summarize(times)['avg'] * 1000, 2)
             
             details = f"Avg: {metrics['avg_upload_time']}s, Max: {metrics['max_upload_time']}s"
         else:
@@ -225,22 +398,25 @@ class PerformanceTester:
     def test_memory_usage(self):
         """Test memory usage during operation"""
         try:
+            # Encode the upload once; the server handles each identical upload independently
+            cert_data = self.create_test_certificate(algorithm="ed25519")
+            body, headers = self.encode_upload('memory_test.pem', cert_data)
+            
             # Get initial memory usage
-            process = psutil.Process()
-            initial_memory = process.memory_info().rss / 1024 / 1024  # MB
+            initial_memory = self._rss_mb()
             
             # Perform operations that might cause memory leaks
-            for i in range(20):
-                cert_data = self.create_test_certificate()
-                files = {'file': (f'memory_test_{i}.pem', cert_data, 'application/x-pem-file')}
-                
+            for _ in range(20):
                 try:
-                    requests.post(f"{self.base_url}/upload-certificate", files=files, timeout=10)
+                    self.session.post(self.url_upload, data=body, headers=headers, timeout=10)
                 except Exception:
                     pass
             
+            # Drop client-side response buffers before sampling
+            gc.collect()
+            
             # Get final memory usage
-            final_memory = process.memory_info().rss / 1024 / 1024  # MB
+            final_memory = self._rss_mb()
             memory_increase = final_memory - initial_memory
             
             # Acceptable memory increase: < 50MB
@@ -265,34 +441,35 @@ class PerformanceTester:
     def test_cpu_usage(self):
         """Test CPU usage during load"""
         try:
-            # Monitor CPU usage during concurrent requests
+            # Attribute CPU to the server process when it is local, otherwise fall back to system-wide
+            server = self._server_process()
+            sample_cpu = server.cpu_percent if server is not None else psutil.cpu_percent
+            # Per-process readings are summed over cores; scale to the same 0-100 range as system-wide
+            cpu_scale = (psutil.cpu_count() or 1) if server is not None else 1
             cpu_samples = []
             
-            def monitor_cpu():
-                for _ in range(30):  # Monitor for 30 seconds
-                    cpu_samples.append(psutil.cpu_percent(interval=1))
-            
-            def generate_load():
-                for _ in range(50):
-                    try:
-                        requests.get(f"{self.base_url}/health", timeout=5)
+            # Drive load from this thread and sample between requests; no monitor thread to contend for the GIL
+            sample_cpu(interval=None)  # Prime: the next call reports usage since this one
+            window_start = time.perf_counter()
+            for _ in range(200):
+                try:
+                    self.session.get(self.url_health, timeout=5)
+                    if SLOW_STRESS:
                         time.sleep(0.1)
-                    except Exception:
-                        pass
-            
-            # Start monitoring and load generation
-            monitor_thread = threading.Thread(target=monitor_cpu)
-            load_thread = threading.Thread(target=generate_load)
-            
-            monitor_thread.start()
-            load_thread.start()
-            
-            load_thread.join()
-            monitor_thread.join()
+                except Exception:
+                    pass
+                now = time.perf_counter()
+                if now - window_start >= CPU_SAMPLE_WINDOW:
+                    cpu_samples.append(sample_cpu(interval=None) / cpu_scale)
+                    window_start = now
+            if not cpu_samples:
+                # Load finished inside one window; close it out rather than report a tick-sized sample
+                time.sleep(max(CPU_SAMPLE_WINDOW - (time.perf_counter() - window_start), 0))
+                cpu_samples.append(sample_cpu(interval=None) / cpu_scale)
             
             if cpu_samples:
-                avg_cpu = statistics.mean(cpu_samples)
-                max_cpu = max(cpu_samples)
+                summary = summarize(cpu_samples)
+                avg_cpu, max_cpu = summary['avg'], summary['max']
                 
                 # Reasonable CPU usage: avg < 50%, max < 80%
                 success = avg_cpu < 50 and max_cpu < 80
@@ -300,7 +477,8 @@ class PerformanceTester:
                 metrics = {
                     'avg_cpu_percent': round(avg_cpu, 2),
                     'max_cpu_percent': round(max_cpu, 2),
-                    'samples': len(cpu_samples)
+                    'samples': len(cpu_samples),
+                    'source': 'server' if server is not None else 'system'
                 }
                 
                 details = f"Avg: {metrics['avg_cpu_percent']}%, Max: {metrics['max_cpu_percent']}%"
@@ -320,20 +498,22 @@ class PerformanceTester:
     def test_database_performance(self):
         """Test database operation performance"""
         try:
+            self._warmup("/dashboard-statistics", n=2)
+            
             # Test statistics retrieval multiple times
             response_times = []
             
             for _ in range(20):
-                start_time = time.time()
-                response = requests.get(f"{self.base_url}/dashboard-statistics")
-                end_time = time.time()
+                start_time = time.perf_counter()
+                response = self.session.get(self.url_stats, timeout=10)
+                end_time = time.perf_counter()
                 
                 if response.status_code == 200:
                     response_times.append(end_time - start_time)
             
             if response_times:
-                avg_time = statistics.mean(response_times)
-                max_time = max(response_times)
+                summary = summarize(response_times)
+                avg_time, max_time = summary['avg'], summary['max']
                 
                 # Good DB performance: avg < 100ms, max < 500ms
                 success = avg_time < 0.1 and max_time < 0.5
@@ -341,6 +521,7 @@ class PerformanceTester:
                 metrics = {
                     'avg_db_time': round(avg_time * 1000, 2),  # ms
                     'max_db_time': round(max_time * 1000, 2),  # ms
+                    'p95_db_time': round(summary['p95'] * 1000, 2),  # ms
                     'queries_tested': len(response_times)
                 }
                 
@@ -361,37 +542,38 @@ class PerformanceTester:
     def test_stress_test(self):
         """Stress test with high load"""
         def stress_worker():
+            session = self._session()
             success_count = 0
             total_count = 0
             
             for _ in range(10):  # 10 requests per worker
                 total_count += 1
                 try:
-                    response = requests.get(f"{self.base_url}/health", timeout=5)
+                    response = session.get(self.url_health, timeout=5)
                     if response.status_code == 200:
                         success_count += 1
                 except Exception:
                     pass
                 
-                time.sleep(0.01)  # Small delay between requests
+                if SLOW_STRESS:
+                    time.sleep(0.01)  # Small delay between requests
             
             return success_count, total_count
         
         # Run stress test with many workers
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         with ThreadPoolExecutor(max_workers=50) as executor:
-            futures = [executor.submit(stress_worker) for _ in range(50)]
-            
             total_success = 0
             total_requests = 0
             
-            for future in as_completed(futures):
-                success, total = future.result()
+            # Tally as map yields; it drops each Future once its result is consumed
+            for success, total in executor.map(lambda _: stress_worker(), range(50)):
                 total_success += success
                 total_requests += total
         
-        end_time = time.time()
+        end_time = time.perf_counter()
+        self._close_thread_sessions()
         duration = end_time - start_time
         
         success_rate = total_success / total_requests if total_requests > 0 else 0
@@ -418,9 +600,12 @@ class PerformanceTester:
         print("⚡ Starting Performance Test Suite")
         print("=" * 60)
         
+        # Prime the connection pool and the server before anything is timed
+        self._warmup()
+        
         # Basic performance tests
         self.test_api_response_time()
-        self.test_concurrent_requests(10, 5)
+        self.test_concurrent_requests()  # Normal and higher load
         self.test_file_upload_performance()
         self.test_database_performance()
         
@@ -429,7 +614,6 @@ class PerformanceTester:
         self.test_cpu_usage()
         
         # Stress tests
-        self.test_concurrent_requests(20, 10)  # Higher load
         self.test_stress_test()
         
         # Summary
@@ -449,12 +633,7 @@ class PerformanceTester:
             print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
         
         # Performance metrics summary
-        print("\n📈 Key Performance Metrics:")
-        for result in self.test_results:
-            if result.get('metrics'):
-                print(f"  {result['test']}:")
-                for key, value in result['metrics'].items():
-                    print(f"    {key}: {value}")
+        sys.stdout.write("\n".join(["\n📈 Key Performance Metrics:", *self._metric_lines]) + "\n")
         
         if failed_tests > 0:
             print("\n❌ Performance Issues:")
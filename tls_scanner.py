@@ -6,8 +6,9 @@ Comprehensive TLS certificate scanner (implicit TLS + STARTTLS) with many edge c
 Features:
 - Resolve CNAMEs and A/AAAA records (optionally follow CNAME chain)
 - Optionally scan all resolved IPs or only first IP
+- Quick TCP connect probe of every IP/port so closed and filtered ports skip the TLS timeout
 - Implicit TLS support (443, 8443, 993, 995, 465...)
-- STARTTLS support via openssl s_client for protocols: smtp, imap, pop3, ftp, xmpp (configurable)
+- STARTTLS support for protocols: smtp, imap, pop3 (negotiated in Python), ftp, xmpp (via openssl s_client)
 - Captures leaf cert and certificate chain (via openssl -showcerts fallback)
 - Parses certificate using cryptography to extract:
   - subject, issuer, SANs, validity, serial
@@ -18,22 +19,30 @@ Features:
 
 Requirements:
   pip install dnspython cryptography
-  openssl CLI in PATH (used for STARTTLS and chain extraction)
+  openssl CLI in PATH (used for ftp/xmpp STARTTLS and as a chain extraction fallback)
 
 Usage examples:
   python tls_scanner.py --host example.com --ports 443 8443 --follow-cname --resolve-all-ips --starttls smtp imap --concurrency 20 --timeout 8 --out results.json
   python tls_scanner.py --input hosts.txt --ports 443 993 995 --out results.json
+  python tls_scanner.py --input hosts.txt --jsonl --quiet --out results.jsonl
 """
 
 import argparse
+import functools
+import errno
+import hashlib
+import ipaddress
 import socket
 import ssl
 import subprocess
 import json
+import selectors
 import sys
-import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional, Tuple
 import shutil
 
@@ -46,13 +55,18 @@ except Exception:
 
 try:
     from cryptography import x509
-    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives import serialization
     from cryptography.hazmat.primitives.asymmetric import rsa, dsa, ec
     from cryptography.hazmat.backends import default_backend
 except Exception:
     print("Missing dependency 'cryptography'. Install with: pip install cryptography", file=sys.stderr)
     raise
 
+try:
+    import orjson
+except ImportError:  # Optional: falls back to the stdlib json encoder
+    orjson = None
+
 # Known STARTTLS-capable protocols mapping; openssl supports these names.
 STARTTLS_PORT_PROTO = {
     25: 'smtp',
@@ -66,17 +80,80 @@ STARTTLS_PORT_PROTO = {
 # Ports commonly treated as implicit TLS
 IMPLICIT_TLS_PORTS = {443, 8443, 993, 995, 465, 5061}  # extend as needed
 
+# One client context shared by every handshake; building it per call re-reads the trust store.
+# Never mutated after import, so it is safe to share across worker threads.
+_SSL_CTX = ssl.create_default_context()
+_SSL_CTX.check_hostname = False
+_SSL_CTX.verify_mode = ssl.CERT_NONE
+# Each target is handshaken once, so a ticket would never be redeemed; skip asking for one.
+# Resumption is also off the table: a resumed handshake carries no Certificate message.
+_SSL_CTX.options |= ssl.OP_NO_COMPRESSION | ssl.OP_NO_TICKET
+
+_PEM_BEGIN = '-----BEGIN CERTIFICATE-----'
+_PEM_END = '-----END CERTIFICATE-----'
+
+
+# Shared resolver plus a TTL-honouring LRU answer cache, so related hosts and repeated
+# scans don't re-query records that are still fresh, while large --input runs stay bounded
+_RESOLVER = dns.resolver.Resolver()  # reads resolv.conf / registry once, not per lookup
+_RESOLVER.timeout = 2.0   # per nameserver attempt
+_RESOLVER.lifetime = 5.0  # total budget per query, so a dead resolver can't stall a worker
+_DNS_CACHE: 'OrderedDict[Tuple[str, str], Tuple[float, List[Any]]]' = OrderedDict()
+_DNS_CACHE_MAX = 4096
+_DNS_CACHE_LOCK = threading.Lock()
+# Empty (NODATA) answers without an SOA carry an effectively infinite expiration; bound them
+_NEGATIVE_TTL_CAP = 300.0
+
 
-def follow_cname_chain(name: str, max_depth: int = 10) -> Tuple[str, List[str]]:
-    resolver = dns.resolver.Resolver()
+def _cached_resolve(name: str, rdtype: str) -> List[Any]:
+    """
+    Resolve name/rdtype, reusing a cached answer until its TTL expires.
+    Returns the rdata list (empty when there is no answer); DNS errors propagate uncached.
+    The cache keeps the _DNS_CACHE_MAX most recently used entries.
+    """
+    key = (name.lower(), rdtype)
+    now = time.monotonic()
+    with _DNS_CACHE_LOCK:
+        hit = _DNS_CACHE.get(key)
+        if hit is not None:
+            if hit[0] > now:
+                _DNS_CACHE.move_to_end(key)
+                return hit[1]
+            # Expired: drop it now so a failed re-query doesn't leave it behind
+            del _DNS_CACHE[key]
+    ans = _RESOLVER.resolve(name, rdtype, raise_on_no_answer=False)
+    records = list(ans) if ans.rrset is not None else []
+    # Answer.expiration is wall-clock time of the shortest TTL in the response
+    ttl = max(ans.expiration - time.time(), 0)
+    if not records:
+        ttl = min(ttl, _NEGATIVE_TTL_CAP)
+    expiry = now + ttl
+    with _DNS_CACHE_LOCK:
+        _DNS_CACHE[key] = (expiry, records)
+        _DNS_CACHE.move_to_end(key)
+        while len(_DNS_CACHE) > _DNS_CACHE_MAX:
+            _DNS_CACHE.popitem(last=False)
+    return records
+
+
+def follow_cname_chain(name: str, max_depth: int = 6) -> Tuple[str, List[str]]:
+    """Follow CNAMEs from name, at most max_depth hops.
+
+    Real-world chains almost always resolve within 6 hops; the cap and the
+    visited set keep long or cyclic chains from costing more lookups.
+    """
     chain = []
     current = name
+    visited = {name.lower()}
     for _ in range(max_depth):
         try:
-            ans = resolver.resolve(current, 'CNAME', raise_on_no_answer=False)
-            if not ans or len(ans) == 0:
+            records = _cached_resolve(current, 'CNAME')
+            if not records:
                 break
-            target = str(ans[0].target).rstrip('.')
+            target = str(records[0].target).rstrip('.')
+            if target.lower() in visited:
+                break
+            visited.add(target.lower())
             chain.append(target)
             current = target
         except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN, dns.exception.DNSException):
@@ -84,20 +161,24 @@ def follow_cname_chain(name: str, max_depth: int = 10) -> Tuple[str, List[str]]:
     return current, chain
 
 
-def resolve_ips(name: str) -> List[str]:
-    resolver = dns.resolver.Resolver()
-    ips = []
+def _resolve_addresses(name: str, rdtype: str) -> List[str]:
     try:
-        for r in resolver.resolve(name, 'A', raise_on_no_answer=False):
-            ips.append(str(r))
+        return [str(r) for r in _cached_resolve(name, rdtype)]
     except Exception:
-        pass
-    try:
-        for r in resolver.resolve(name, 'AAAA', raise_on_no_answer=False):
-            ips.append(str(r))
-    except Exception:
-        pass
-    return ips
+        return []
+
+
+def resolve_ips(name: str, pool: Optional[ThreadPoolExecutor] = None) -> List[str]:
+    """Return A then AAAA addresses for name.
+
+    With a pool, the AAAA query is submitted to it while the A query runs in the calling
+    thread, so the two overlap and only one helper thread is needed per caller.
+    """
+    if pool is None:
+        return _resolve_addresses(name, 'A') + _resolve_addresses(name, 'AAAA')
+    ipv6 = pool.submit(_resolve_addresses, name, 'AAAA')
+    ipv4 = _resolve_addresses(name, 'A')
+    return ipv4 + ipv6.result()
 
 
 def run_openssl_showcerts(host_for_connect: str, port: int, servername: Optional[str],
@@ -128,15 +209,40 @@ def run_openssl_showcerts(host_for_connect: str, port: int, servername: Optional
 
 
 def extract_pems_from_openssl_output(openssl_out: str) -> List[str]:
-    pems = []
+    # Plain forward scan with str.find; no regex engine needed for fixed armor lines
+    pems: List[str] = []
     if not openssl_out:
         return pems
-    blocks = re.findall(r"(-----BEGIN CERTIFICATE-----.+?-----END CERTIFICATE-----)", openssl_out, re.DOTALL)
-    for b in blocks:
-        pems.append(b)
+    pos = 0
+    while True:
+        begin = openssl_out.find(_PEM_BEGIN, pos)
+        if begin < 0:
+            break
+        end = openssl_out.find(_PEM_END, begin + len(_PEM_BEGIN))
+        if end < 0:
+            break
+        pos = end + len(_PEM_END)
+        pems.append(openssl_out[begin:pos])
     return pems
 
 
+def get_peer_chain_der(ssock: ssl.SSLSocket) -> Optional[List[bytes]]:
+    """
+    Return the certificate chain the peer sent (leaf first) as DER bytes, read from the
+    handshake that already happened. Uses the unverified chain because verification is off.
+    Returns None when this Python cannot expose the chain (before 3.10) so callers can use openssl.
+    """
+    getter = getattr(ssock, 'get_unverified_chain', None)
+    if getter is not None:
+        # Python 3.13+: public API already returns DER bytes
+        return list(getter() or [])
+    sslobj_getter = getattr(getattr(ssock, '_sslobj', None), 'get_unverified_chain', None)
+    if sslobj_getter is None:
+        return None
+    # Python 3.10-3.12: same call on the underlying SSLObject, returning _ssl.Certificate objects
+    return [c.public_bytes(ssl._ssl.ENCODING_DER) for c in sslobj_getter() or []]
+
+
 def parse_cert_from_der(der_bytes: bytes) -> x509.Certificate:
     return x509.load_der_x509_certificate(der_bytes, backend=default_backend())
 
@@ -145,14 +251,14 @@ def parse_cert_from_pem(pem: str) -> x509.Certificate:
     return x509.load_pem_x509_certificate(pem.encode(), backend=default_backend())
 
 
-def cert_to_metadata(cert: x509.Certificate) -> Dict[str, Any]:
+def cert_to_metadata(cert: x509.Certificate, der_bytes: Optional[bytes] = None) -> Dict[str, Any]:
     d: Dict[str, Any] = {}
     try:
         d['subject'] = cert.subject.rfc4514_string()
         d['issuer'] = cert.issuer.rfc4514_string()
         d['not_before'] = cert.not_valid_before.isoformat()
         d['not_after'] = cert.not_valid_after.isoformat()
-        d['serial_number'] = format(cert.serial_number, 'x')
+        d['serial_number'] = f'{cert.serial_number:x}'
     except Exception as e:
         d['parse_error_basic'] = str(e)
 
@@ -197,48 +303,84 @@ def cert_to_metadata(cert: x509.Certificate) -> Dict[str, Any]:
     except Exception:
         d['signature_hash_algorithm'] = None
 
-    # fingerprint SHA256
+    # fingerprint SHA256, hashed straight from the DER when the caller already holds it
     try:
-        fp = cert.fingerprint(hashes.SHA256())
-        d['sha256_fingerprint'] = fp.hex()
+        if der_bytes is None:
+            der_bytes = cert.public_bytes(serialization.Encoding.DER)
+        d['sha256_fingerprint'] = hashlib.sha256(der_bytes).hexdigest()
     except Exception:
         d['sha256_fingerprint'] = None
 
     return d
 
 
+# Chains across a multi-host scan repeat the same intermediates; decode each distinct
+# certificate once. lru_cache is thread-safe, bounded, and does not cache parse failures.
+@functools.lru_cache(maxsize=4096)
+def _cached_metadata_from_der(der_bytes: bytes) -> Dict[str, Any]:
+    return cert_to_metadata(parse_cert_from_der(der_bytes), der_bytes)
+
+
+def metadata_from_der(der_bytes: bytes) -> Dict[str, Any]:
+    # Hand each caller its own copy; the cached dict is shared by every host with this certificate
+    meta = dict(_cached_metadata_from_der(der_bytes))
+    meta['san'] = list(meta['san'])
+    return meta
+
+
+def metadata_from_pem(pem: str) -> Dict[str, Any]:
+    # Decode the armor once and share the DER cache, so openssl output and in-process chains
+    # for the same certificate are parsed only once.
+    return metadata_from_der(ssl.PEM_cert_to_DER_cert(pem))
+
+
 def fetch_cert_implicit(ip: str, port: int, servername: Optional[str], timeout: int = 8) -> Dict[str, Any]:
     """
-    Try Python ssl first for leaf DER, then use openssl for full chain if available.
+    Read the chain (leaf first) from the Python ssl handshake. Only if Python cannot expose it,
+    take the leaf from getpeercert and the chain from openssl.
     Connects to IP:port, uses SNI=servername when wrapping TLS.
     """
     out: Dict[str, Any] = {'ip': ip, 'port': port, 'mode': 'implicit', 'servername': servername}
     try:
-        ctx = ssl.create_default_context()
-        ctx.check_hostname = False
-        ctx.verify_mode = ssl.CERT_NONE
         with socket.create_connection((ip, port), timeout=timeout) as sock:
-            with ctx.wrap_socket(sock, server_hostname=servername) as ssock:
-                der = ssock.getpeercert(binary_form=True)
-                if der:
-                    try:
-                        cert = parse_cert_from_der(der)
-                        out['leaf'] = cert_to_metadata(cert)
-                    except Exception:
-                        out.setdefault('warnings', []).append('failed_parse_leaf_from_der')
-                # Try to get chain via openssl to capture intermediates
-                openssl_out, openssl_err = run_openssl_showcerts(ip, port, servername, None, timeout=timeout)
-                if openssl_out:
-                    pems = extract_pems_from_openssl_output(openssl_out)
-                    chain = []
-                    for pem in pems:
+            with _SSL_CTX.wrap_socket(sock, server_hostname=servername) as ssock:
+                try:
+                    chain_der = get_peer_chain_der(ssock)
+                except Exception:
+                    chain_der = None
+                # The chain already starts with the leaf; only ask for it separately without one
+                if not chain_der:
+                    der = ssock.getpeercert(binary_form=True)
+                    if der:
                         try:
-                            c = parse_cert_from_pem(pem)
-                            chain.append(cert_to_metadata(c))
+                            out['leaf'] = metadata_from_der(der)
                         except Exception:
-                            chain.append({'parse_error': 'parse_failed_for_pem'})
-                    if chain:
-                        out['chain'] = chain
+                            out.setdefault('warnings', []).append('failed_parse_leaf_from_der')
+        if chain_der:
+            chain = []
+            for cert_der in chain_der:
+                try:
+                    chain.append(metadata_from_der(cert_der))
+                except Exception:
+                    chain.append({'parse_error': 'parse_failed_for_der'})
+            out['chain'] = chain
+            if 'parse_error' in chain[0]:
+                out.setdefault('warnings', []).append('failed_parse_leaf_from_der')
+            else:
+                out['leaf'] = chain[0]
+        elif chain_der is None:
+            # Try to get chain via openssl to capture intermediates
+            openssl_out, openssl_err = run_openssl_showcerts(ip, port, servername, None, timeout=timeout)
+            if openssl_out:
+                pems = extract_pems_from_openssl_output(openssl_out)
+                chain = []
+                for pem in pems:
+                    try:
+                        chain.append(metadata_from_pem(pem))
+                    except Exception:
+                        chain.append({'parse_error': 'parse_failed_for_pem'})
+                if chain:
+                    out['chain'] = chain
         out['error'] = None
     except Exception as e:
         # fallback: try openssl only (some servers require different ClientHello)
@@ -248,8 +390,7 @@ def fetch_cert_implicit(ip: str, port: int, servername: Optional[str], timeout:
             chain = []
             for pem in pems:
                 try:
-                    c = parse_cert_from_pem(pem)
-                    chain.append(cert_to_metadata(c))
+                    chain.append(metadata_from_pem(pem))
                 except Exception:
                     chain.append({'parse_error': 'parse_failed_for_pem'})
             if chain:
@@ -263,12 +404,82 @@ def fetch_cert_implicit(ip: str, port: int, servername: Optional[str], timeout:
     return out
 
 
+def _reply_line_done(buf: bytes) -> bool:
+    return buf.endswith(b'\n')
+
+
+def _smtp_reply_done(buf: bytes) -> bool:
+    # Multi-line SMTP replies use "250-"; the final line has a space (or nothing) after the code
+    if not buf.endswith(b'\n'):
+        return False
+    last = buf.rstrip(b'\r\n').rsplit(b'\n', 1)[-1]
+    return last[3:4] in (b' ', b'')
+
+
+def _imap_tagged_done(buf: bytes) -> bool:
+    return buf.endswith(b'\n') and buf.rstrip(b'\r\n').rsplit(b'\n', 1)[-1].startswith(b'a1 ')
+
+
+# Plaintext preamble per protocol: (command to send or None, reply complete?, required prefix of last line)
+STARTTLS_DIALOGS = {
+    'smtp': (
+        (None, _smtp_reply_done, '220'),
+        (b'EHLO mail.example.com\r\n', _smtp_reply_done, '250'),  # same EHLO name openssl s_client sends
+        (b'STARTTLS\r\n', _smtp_reply_done, '220'),
+    ),
+    'imap': (
+        (None, _reply_line_done, '* OK'),
+        (b'a1 STARTTLS\r\n', _imap_tagged_done, 'a1 OK'),
+    ),
+    'pop3': (
+        (None, _reply_line_done, '+OK'),
+        (b'STLS\r\n', _reply_line_done, '+OK'),
+    ),
+}
+
+
+def negotiate_starttls(sock: socket.socket, starttls_proto: str) -> None:
+    """Run the protocol's plaintext STARTTLS exchange; raises ConnectionError if the server refuses."""
+    for command, reply_done, ok_prefix in STARTTLS_DIALOGS[starttls_proto]:
+        if command:
+            sock.sendall(command)
+        buf = b''
+        while not reply_done(buf):
+            data = sock.recv(4096)
+            if not data or len(buf) > 65536:
+                raise ConnectionError(f'{starttls_proto} STARTTLS: connection closed or reply too long')
+            buf += data
+        last = buf.decode('latin-1').rstrip('\r\n').rsplit('\n', 1)[-1]
+        if not last.startswith(ok_prefix):
+            raise ConnectionError(f'{starttls_proto} STARTTLS refused: {last[:200]}')
+
+
 def fetch_cert_starttls(target_host: str, port: int, starttls_proto: str, servername: Optional[str], timeout: int = 8) -> Dict[str, Any]:
     """
-    Use openssl -starttls <proto> to perform STARTTLS and extract cert chain.
-    target_host is used for TCP connect; servername used for -servername (SNI).
+    Perform STARTTLS and extract the cert chain: in Python for protocols in STARTTLS_DIALOGS,
+    otherwise (or if that fails) via openssl -starttls <proto>.
+    target_host is used for TCP connect; servername used for SNI.
     """
     out: Dict[str, Any] = {'host': target_host, 'port': port, 'mode': 'starttls', 'protocol': starttls_proto, 'servername': servername}
+    if starttls_proto in STARTTLS_DIALOGS:
+        try:
+            with socket.create_connection((target_host, port), timeout=timeout) as sock:
+                negotiate_starttls(sock, starttls_proto)
+                with _SSL_CTX.wrap_socket(sock, server_hostname=servername) as ssock:
+                    chain_der = get_peer_chain_der(ssock)
+            if chain_der:
+                chain = []
+                for cert_der in chain_der:
+                    try:
+                        chain.append(metadata_from_der(cert_der))
+                    except Exception as e:
+                        chain.append({'parse_error': str(e)})
+                out['chain'] = chain
+                out['leaf'] = chain[0]
+                out['error'] = None
+                return out
+        except Exception:
+            pass  # fall back to openssl below, which reports its own error
     openssl_out, openssl_err = run_openssl_showcerts(target_host, port, servername, starttls_proto, timeout=timeout)
     if not openssl_out:
         out['error'] = openssl_err or 'no_output_from_openssl'
@@ -281,8 +492,7 @@ def fetch_cert_starttls(target_host: str, port: int, starttls_proto: str, server
     chain = []
     for pem in pems:
         try:
-            c = parse_cert_from_pem(pem)
-            chain.append(cert_to_metadata(c))
+            chain.append(metadata_from_pem(pem))
         except Exception as e:
             chain.append({'parse_error': str(e)})
     out['chain'] = chain
@@ -291,10 +501,72 @@ def fetch_cert_starttls(target_host: str, port: int, starttls_proto: str, server
     return out
 
 
-def scan_target(host: str, ports: List[int], follow_cname: bool = True, resolve_all_ips: bool = True,
-                starttls_protocols: List[str] = [], concurrency: int = 10, timeout: int = 8) -> Dict[str, Any]:
-    """Main orchestration function. Returns dict with results list."""
-    result = {'requested_host': host, 'scanned_at': datetime.utcnow().isoformat() + 'Z', 'results': []}
+_CONNECT_PENDING = {errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY}
+
+
+# Longer than Linux's 1 s initial SYN retransmit, so one lost SYN is resent inside the budget
+# instead of a live port being written off as filtered
+DEFAULT_PROBE_TIMEOUT = 1.5
+
+
+def _probe_ports(endpoints: List[Tuple[str, int]], timeout: float = DEFAULT_PROBE_TIMEOUT) -> Dict[Tuple[str, int], str]:
+    """Return the (ip, port) endpoints that did not accept a TCP connect, with the reason.
+
+    All connects are started non-blocking at once in a single selector and share one
+    timeout budget. Refused or erroring connects map to 'port_closed'; connects with no
+    answer when the budget runs out map to 'port_filtered'. Hostname literals are not
+    probed and are never reported.
+    """
+    unreachable: Dict[Tuple[str, int], str] = {}
+    # selectors picks epoll/kqueue where available, so high fd numbers are fine (select()
+    # fails past FD_SETSIZE); on Windows it also surfaces refused connects
+    with selectors.DefaultSelector() as sel:
+        try:
+            for endpoint in set(endpoints):
+                ip, port = endpoint
+                try:
+                    family = socket.AF_INET6 if ipaddress.ip_address(ip).version == 6 else socket.AF_INET
+                except ValueError:
+                    continue
+                sock = socket.socket(family, socket.SOCK_STREAM)
+                sock.setblocking(False)
+                rc = sock.connect_ex((ip, port))
+                if rc in _CONNECT_PENDING:
+                    sel.register(sock, selectors.EVENT_WRITE, endpoint)
+                    continue
+                if rc != 0:
+                    unreachable[endpoint] = 'port_closed'
+                sock.close()
+            deadline = time.monotonic() + timeout
+            while sel.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                for key, _ in sel.select(remaining):
+                    sel.unregister(key.fileobj)
+                    if key.fileobj.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) != 0:
+                        unreachable[key.data] = 'port_closed'
+                    key.fileobj.close()
+        finally:
+            for key in list(sel.get_map().values()):
+                # Still silent after the budget (and the kernel's SYN retransmit): dropped
+                unreachable[key.data] = 'port_filtered'
+                key.fileobj.close()
+    return unreachable
+
+
+def plan_target(host: str, ports: List[int], follow_cname: bool = True, resolve_all_ips: bool = True,
+                starttls_protocols: List[str] = [],
+                probe_timeout: float = DEFAULT_PROBE_TIMEOUT,
+                dns_pool: Optional[ThreadPoolExecutor] = None) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Resolve host and build its (ip, port) work list. Returns (result skeleton, tasks).
+
+    With probe_timeout > 0, every (ip, port) of the host is probed in one pass; ports that
+    refuse or don't answer a TCP connect within that budget are recorded straight into the
+    result as closed/filtered instead of being scheduled.
+    """
+    scanned_at = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    result = {'requested_host': host, 'scanned_at': scanned_at, 'results': []}
     canonical = host
     cname_chain = []
     if follow_cname:
@@ -305,57 +577,143 @@ def scan_target(host: str, ports: List[int], follow_cname: bool = True, resolve_
     result['canonical_name'] = canonical
     result['cname_chain'] = cname_chain
 
-    ips = resolve_ips(canonical)
+    ips = resolve_ips(canonical, dns_pool)
     if not ips:
         # If no DNS records, and host looks like IP, scan that literal
         ips = [host]
 
     result['resolved_ips'] = ips
 
+    scan_ips = ips if resolve_all_ips else ips[:1]
+    unreachable = {}
+    if probe_timeout > 0:
+        unreachable = _probe_ports([(ip, port) for ip in scan_ips for port in ports], probe_timeout)
+
     tasks = []
-    for ip in ips if resolve_all_ips else ips[:1]:
+    for ip in scan_ips:
         for port in ports:
             # Determine mode: implicit TLS or STARTTLS if listed
             if port in IMPLICIT_TLS_PORTS:
-                tasks.append(('implicit', ip, port, host))
+                task = {'type': 'implicit', 'ip': ip, 'port': port, 'sni': host}
             else:
                 proto = STARTTLS_PORT_PROTO.get(port)
                 if proto and proto in starttls_protocols:
-                    tasks.append(('starttls', ip, port, proto, host))
+                    task = {'type': 'starttls', 'ip': ip, 'port': port, 'proto': proto, 'sni': host}
                 else:
                     # Try implicit first for unknown ports (safe approach) but record choice
-                    tasks.append(('implicit', ip, port, host))
-
-    # Concurrency using ThreadPoolExecutor
-    with ThreadPoolExecutor(max_workers=concurrency) as ex:
-        future_map = {}
-        for t in tasks:
-            if t[0] == 'implicit':
-                _, ip, port, host_for_sni = t
-                fut = ex.submit(fetch_cert_implicit, ip, port, host_for_sni, timeout)
-                future_map[fut] = {'type': 'implicit', 'ip': ip, 'port': port, 'sni': host_for_sni}
+                    task = {'type': 'implicit', 'ip': ip, 'port': port, 'sni': host}
+            reason = unreachable.get((ip, port))
+            if reason is None:
+                tasks.append(task)
             else:
-                _, ip, port, proto, host_for_sni = t
-                # For STARTTLS, we connect to ip (target) but use host_for_sni as -servername
-                fut = ex.submit(fetch_cert_starttls, ip, port, proto, host_for_sni, timeout)
-                future_map[fut] = {'type': 'starttls', 'ip': ip, 'port': port, 'proto': proto, 'sni': host_for_sni}
+                result['results'].append({
+                    'type': task['type'],
+                    'ip': ip,
+                    'port': port,
+                    'sni': host,
+                    'result': {'error': reason}
+                })
+    return result, tasks
+
+
+def run_task(task: Dict[str, Any], timeout: int = 8) -> Dict[str, Any]:
+    """Fetch the certificate for one planned task and wrap it as a result entry."""
+    try:
+        if task['type'] == 'implicit':
+            res = fetch_cert_implicit(task['ip'], task['port'], task['sni'], timeout)
+        else:
+            # For STARTTLS, we connect to ip (target) but use sni as -servername
+            res = fetch_cert_starttls(task['ip'], task['port'], task['proto'], task['sni'], timeout)
+    except Exception as e:
+        res = {'error': str(e)}
+    return {
+        'type': task['type'],
+        'ip': task['ip'],
+        'port': task['port'],
+        'sni': task['sni'],
+        'result': res
+    }
+
+
+def scan_targets(hosts: List[str], ports: List[int], follow_cname: bool = True, resolve_all_ips: bool = True,
+                 starttls_protocols: List[str] = [], concurrency: int = 10, timeout: int = 8,
+                 probe_timeout: float = DEFAULT_PROBE_TIMEOUT):
+    """Scan many hosts through one shared pool, yielding each host's result as its last task finishes.
+
+    Resolution and TLS fetches share the pool, so a slow host's handshakes overlap with other
+    hosts' work instead of holding up the queue. At most `concurrency` hosts are open (being
+    planned or scanned) at a time; the next host is planned as one finishes, so TLS work never
+    queues behind the whole input's DNS. Results come out in completion order.
+    """
+    pending: Dict[int, int] = {}
+    results: Dict[int, Dict[str, Any]] = {}
+    host_iter = iter(enumerate(hosts))
+    # AAAA lookups run here, kept apart from the scan pool so plan workers never wait on their
+    # own pool; one slot per open host keeps DNS scaling with concurrency
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='dns') as dns_pool, \
+            ThreadPoolExecutor(max_workers=concurrency) as ex:
+        in_flight = {}
+        open_hosts = 0
+        while True:
+            # Top up open hosts from the input; each slot frees when a host is yielded
+            while open_hosts < concurrency:
+                nxt = next(host_iter, None)
+                if nxt is None:
+                    break
+                i, h = nxt
+                fut = ex.submit(plan_target, h, ports, follow_cname, resolve_all_ips, starttls_protocols, probe_timeout,
+                                dns_pool)
+                in_flight[fut] = ('plan', i, h)
+                open_hosts += 1
+            if not in_flight:
+                break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in done:
+                kind, i, h = in_flight.pop(fut)
+                if kind == 'plan':
+                    try:
+                        result, tasks = fut.result()
+                    except Exception as e:
+                        open_hosts -= 1
+                        yield {'requested_host': h, 'error': str(e), 'results': []}
+                        continue
+                    if not tasks:
+                        open_hosts -= 1
+                        yield result
+                        continue
+                    results[i] = result
+                    pending[i] = len(tasks)
+                    for t in tasks:
+                        in_flight[ex.submit(run_task, t, timeout)] = ('task', i, h)
+                else:
+                    results[i]['results'].append(fut.result())
+                    pending[i] -= 1
+                    if not pending[i]:
+                        del pending[i]
+                        open_hosts -= 1
+                        yield results.pop(i)
+
+
+def scan_target(host: str, ports: List[int], follow_cname: bool = True, resolve_all_ips: bool = True,
+                starttls_protocols: List[str] = [], concurrency: int = 10, timeout: int = 8,
+                probe_timeout: float = DEFAULT_PROBE_TIMEOUT) -> Dict[str, Any]:
+    """Main orchestration function. Returns dict with results list."""
+    scans = scan_targets([host], ports, follow_cname=follow_cname, resolve_all_ips=resolve_all_ips,
+                         starttls_protocols=starttls_protocols, concurrency=concurrency, timeout=timeout,
+                         probe_timeout=probe_timeout)
+    try:
+        return next(scans)
+    finally:
+        scans.close()
 
-        for fut in as_completed(future_map):
-            meta = future_map[fut]
-            try:
-                res = fut.result()
-            except Exception as e:
-                res = {'error': str(e)}
-            entry = {
-                'type': meta.get('type'),
-                'ip': meta.get('ip'),
-                'port': meta.get('port'),
-                'sni': meta.get('sni'),
-                'result': res
-            }
-            result['results'].append(entry)
 
-    return result
+def to_json(obj: Any, indent: bool = True) -> str:
+    """Serialize a scan result as 2-space indented (or compact, single-line) JSON, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None).decode()
+    if indent:
+        return json.dumps(obj, indent=2)
+    return json.dumps(obj, separators=(',', ':'))
 
 
 def main():
@@ -364,12 +722,15 @@ def main():
     group.add_argument('--host', help='Single host (domain name or IP) to scan')
     group.add_argument('--input', help='File with one host per line to scan')
     parser.add_argument('--ports', type=int, nargs='+', default=None, help='Ports to scan (space separated). If not specified, scans all common TLS ports: 443, 8443, 993, 995, 465, 5061, 25, 587, 143, 110, 21, 5222')
-    parser.add_argument('--follow-cname', action='store_true', help='Follow CNAME chain to the final target')
+    parser.add_argument('--follow-cname', action='store_true', help='Follow CNAME chain to the final target (up to 6 hops, stops on loops)')
     parser.add_argument('--resolve-all-ips', action='store_true', help='Resolve and scan all A/AAAA records (default: false)')
     parser.add_argument('--starttls', nargs='*', default=[], help='List of STARTTLS protocols to attempt (e.g., smtp imap pop3)')
     parser.add_argument('--concurrency', type=int, default=10, help='Max concurrent workers')
     parser.add_argument('--timeout', type=int, default=8, help='Network timeout seconds for each connection')
+    parser.add_argument('--probe-timeout', type=float, default=DEFAULT_PROBE_TIMEOUT, help='Seconds to TCP-probe all of a host\'s IPs/ports before TLS; refused or unanswered ports are skipped. Keep above the OS\'s first SYN retransmit (0 disables the probe)')
     parser.add_argument('--out', help='Write JSON output to file')
+    parser.add_argument('--jsonl', action='store_true', help='Write one compact JSON object per host per line (to --out, or stdout)')
+    parser.add_argument('--quiet', action='store_true', help='Do not pretty print results to stdout')
     args = parser.parse_args()
     
     # If no ports specified, scan all common TLS ports
@@ -394,21 +755,41 @@ def main():
     elif args.host:
         hosts = [args.host.strip()]
 
-    all_results = []
-    for h in hosts:
-        r = scan_target(h, args.ports, follow_cname=args.follow_cname, resolve_all_ips=args.resolve_all_ips,
-                        starttls_protocols=[p.lower() for p in args.starttls], concurrency=args.concurrency, timeout=args.timeout)
-        all_results.append(r)
-        # Pretty print one result at a time for progress
-        print(json.dumps(r, indent=2))
-
+    # Stream the output file one host at a time instead of holding every result: a JSON array
+    # by default, or one compact object per line with --jsonl
+    outf = None
     if args.out:
         try:
-            with open(args.out, 'w', encoding='utf-8') as outf:
-                json.dump(all_results, outf, indent=2)
+            outf = open(args.out, 'w', encoding='utf-8')
+            if not args.jsonl:
+                outf.write('[')
         except Exception as e:
             print(f"Failed to write output file: {e}", file=sys.stderr)
+    # --jsonl without --out sends the lines to stdout for jq and friends, replacing the pretty print
+    line_out = (outf or sys.stdout) if args.jsonl else None
+    pretty = not args.quiet and not (args.jsonl and not outf)
 
+    try:
+        # One pool for every host; results arrive as each host's tasks drain
+        scans = scan_targets(hosts, args.ports, follow_cname=args.follow_cname, resolve_all_ips=args.resolve_all_ips,
+                             starttls_protocols=[p.lower() for p in args.starttls], concurrency=args.concurrency, timeout=args.timeout,
+                             probe_timeout=args.probe_timeout)
+        for i, r in enumerate(scans):
+            if line_out:
+                line_out.write(to_json(r, indent=False) + '\n')
+                line_out.flush()
+            # Serialize once for both the progress output and the array file
+            text = to_json(r) if pretty or (outf and not args.jsonl) else None
+            if pretty:
+                # Pretty print one result at a time for progress
+                print(text)
+            if outf and not args.jsonl:
+                outf.write(('\n' if i == 0 else ',\n') + text)
+    finally:
+        if outf:
+            if not args.jsonl:
+                outf.write('\n]\n')
+            outf.close()
 
 if __name__ == '__main__':
     main()